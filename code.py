@@ -12,21 +12,24 @@ Last Modified: 2024-02-19
 import board
 import terminalio
 import displayio
+import bitmaptools
 import math
 import time
 from adafruit_display_text.label import Label
 from adafruit_matrixportal.matrix import Matrix
 from adafruit_matrixportal.network import Network
 import adafruit_fakerequests as requests
+from adafruit_requests import OutOfRetries
 from secrets import secrets
-import json
-from fake_weather import FAKE_RESPONSE
 
 # Configuration Constants
 UPDATE_DELAY = 1800  # Weather update interval (30 minutes)
 DISPLAY_UPDATE_INTERVAL = 60  # Display refresh interval (1 minute)
 WEATHER_UPDATE_INTERVAL = 300  # Weather data refresh interval (5 minutes)
+WEATHER_MAX_BACKOFF = 4  # Max doublings of the refresh interval after failed fetches (16x)
 UTC_OFFSET = -5  # EST timezone offset
+UTC_OFFSET_SECONDS = UTC_OFFSET * 3600
+DEBUG = False  # Print the parsed weather values to the serial console
 
 # Display Configuration
 DISPLAY_WIDTH = 64
@@ -42,6 +45,12 @@ TEMP_RANGE_TOP = 2  # Top position of temperature range
 TEMP_RANGE_BOTTOM = 13  # Bottom position of temperature range
 TEMP_RANGE_BAR_X = 0  # X position of temperature range bar (using full width)
 
+# Sun Path Configuration
+# Arc row for each of the 20 columns of the sun path bitmap (raised base, 8px amplitude)
+SUN_ARC_YS = tuple(int(15 - 8 * math.sin((x / 19.0) * math.pi)) for x in range(20))
+# Sun center row for each column, kept inside the bitmap so the glow fits
+SUN_Y_BY_X = tuple(max(1, min(14, y)) for y in SUN_ARC_YS)
+
 def get_data_source_url(lat, long):
     """
     Construct the OpenWeather API URL with the given coordinates.
@@ -57,10 +66,28 @@ def get_data_source_url(lat, long):
         lat, long, secrets['openweather_token']
     )
 
+# The coordinates and token don't change at runtime, so build the URL once
+DATA_SOURCE_URL = get_data_source_url(secrets['lat'], secrets['long'])
+
+# Fields read from the OpenWeather One Call response, in get_weather() result order
+WEATHER_JSON_PATHS = (
+    ["current", "temp"],
+    ["current", "weather", 0, "icon"],
+    ["current", "dt"],
+    ["current", "sunrise"],
+    ["current", "sunset"],
+    ["daily", 0, "temp", "min"],
+    ["daily", 0, "temp", "max"],
+)
+
+# Weather shown when a fetch fails: 70°F, clear day, 0 for time values
+# (12h day length), 60-80°F range
+DEFAULT_WEATHER = (70, "01d", 0, 0, 43200, 60, 80)
+
 # Initialize display hardware
 matrix = Matrix(width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT, bit_depth=DISPLAY_BIT_DEPTH)
 display = matrix.display
-network = Network(status_neopixel=board.NEOPIXEL, debug=True)
+network = Network(status_neopixel=board.NEOPIXEL, debug=False)
 
 print("Starting up...")
 
@@ -78,10 +105,22 @@ icons = displayio.TileGrid(
     y=0    # Move to top
 )
 
-def temp_to_color(temp):
+# Color gradient segments from purple->blue->green->yellow->red, as
+# (low °F, high °F, red start, red slope, green start, green slope, blue start, blue slope)
+# where slopes are per °F above the segment's low temperature
+TEMP_COLOR_SEGMENTS = (
+    (20, 35, 128, -128 / 15, 0, 0, 128, 127 / 15),  # Purple to Blue
+    (35, 50, 0, 0, 0, 255 / 15, 255, -255 / 15),  # Blue to Green
+    (50, 70, 0, 255 / 20, 255, 0, 0, 0),  # Green to Yellow
+    (70, 90, 255, -127.5 / 20, 255, -255 / 20, 0, 0),  # Yellow to Dark Red
+)
+
+def _compute_temp_color(temp):
     """
     Map temperature to color spectrum from purple (<=20°F) to dark red (>=90°F).
     
+    Used once at import to build TEMP_LUT; call temp_to_color() at runtime.
+    
     Args:
         temp: Temperature in Fahrenheit
     
@@ -92,28 +131,30 @@ def temp_to_color(temp):
         return 0x800080  # Purple
     if temp >= 90:
         return 0x800000  # Dark red
-        
-    # Map temperature to a position in the color spectrum
-    # Create a gradient from purple->blue->green->yellow->red
-    if temp < 35:  # Purple to Blue (20-35°F)
-        ratio = (temp - 20) / 15
-        r = int(128 * (1 - ratio))  # Fade from 128 to 0
-        b = int(128 + (127 * ratio))  # Increase from 128 to 255
-        return (r << 16) | b
-    elif temp < 50:  # Blue to Green (35-50°F)
-        ratio = (temp - 35) / 15
-        b = int(255 * (1 - ratio))  # Fade from 255 to 0
-        g = int(255 * ratio)  # Increase from 0 to 255
-        return (g << 8) | b
-    elif temp < 70:  # Green to Yellow (50-70°F)
-        ratio = (temp - 50) / 20
-        r = int(255 * ratio)  # Increase from 0 to 255
-        return (r << 16) | (255 << 8)  # Keep green at 255
-    else:  # Yellow to Dark Red (70-90°F)
-        ratio = (temp - 70) / 20
-        g = int(255 * (1 - ratio))  # Decrease from 255 to 0
-        r = int(255 * (1 - (ratio/2)))  # Decrease from 255 to 128
-        return (r << 16) | (g << 8)
+    
+    for low, high, r, r_slope, g, g_slope, b, b_slope in TEMP_COLOR_SEGMENTS:
+        if temp < high:
+            offset = temp - low
+            return (int(r + r_slope * offset) << 16) | (int(g + g_slope * offset) << 8) | int(b + b_slope * offset)
+
+# Precomputed colors for each whole degree from TEMP_MIN to TEMP_MAX (71 entries)
+TEMP_LUT = tuple(_compute_temp_color(t) for t in range(TEMP_MIN, TEMP_MAX + 1))
+
+def temp_to_color(temp):
+    """
+    Look up the display color for a temperature.
+    
+    Args:
+        temp: Temperature in Fahrenheit (clamped to TEMP_MIN..TEMP_MAX)
+    
+    Returns:
+        int: RGB color value as a 24-bit integer
+    """
+    if temp <= TEMP_MIN:
+        return TEMP_LUT[0]
+    if temp >= TEMP_MAX:
+        return TEMP_LUT[-1]
+    return TEMP_LUT[int(temp) - TEMP_MIN]
 
 # Weather icon indices - matches layout in weather-icons.bmp:
 # Two columns (d=day, n=night) with rows ordered as:
@@ -140,6 +181,11 @@ ICON_MAP = {
     "50n": 17   # Mist night (row 8, col 1)
 }
 
+# ICON_MAP plus a condition-only key ("01", "02", ...) mapping to the day icon,
+# used as the fallback for codes with an unknown day/night suffix
+_ICON_LOOKUP = dict(ICON_MAP)
+_ICON_LOOKUP.update({k[:2]: v for k, v in ICON_MAP.items() if k.endswith('d')})
+
 # Create display labels
 time_label = Label(terminalio.FONT, text="00:00", color=0xFFFFFF)
 time_label.x = 2
@@ -156,9 +202,11 @@ temp_label.y = 15 + (16 // 2)  # Center in bottom half, shifted up
 temp_range_palette = displayio.Palette(16)
 temp_range_palette[0] = 0x000000  # Black (transparent)
 for i in range(12):
-    # Map palette indices 1-12 to temperature range 20-90°F
-    temp = 20 + (i * 70/11)  # Spread across the full temperature range
-    temp_range_palette[12-i] = temp_to_color(temp)  # Store in reverse order so cold colors are at high indices
+    # Map palette indices 1-12 to temperature range 20-90°F, spread across the
+    # full range. Each entry snaps down to the whole degree of 20 + i * 70/11,
+    # since TEMP_LUT only holds whole-degree colors.
+    temp_offset = (i * (TEMP_MAX - TEMP_MIN)) // 11
+    temp_range_palette[12-i] = TEMP_LUT[temp_offset]  # Store in reverse order so cold colors are at high indices
 temp_range_palette[13] = 0xFFFFFF  # White for min/max markers
 temp_range_palette[14] = 0xFFFFFF  # White for current temp marker
 
@@ -175,45 +223,92 @@ temp_range = displayio.TileGrid(temp_range_bitmap, pixel_shader=temp_range_palet
 sun_path_bitmap = displayio.Bitmap(20, 16, 3)
 sun_path = displayio.TileGrid(sun_path_bitmap, pixel_shader=sun_palette, x=42, y=14)  # Moved higher up for better visibility
 
+# Gradient cache for draw_temp_range, rebuilt only when the daily range changes
+_last_range = (None, None)  # (min_temp, max_temp) the gradient was drawn for
+_gradient_rows = ()  # Palette index per row, starting at TEMP_RANGE_TOP
+_last_marker_y = None  # Row currently covered by the current temperature marker
+
 def draw_temp_range(bitmap, current, min_temp, max_temp):
     """
     Draw the temperature range visualization on the given bitmap.
     
+    The gradient is only redrawn when min_temp/max_temp change; otherwise just
+    the current temperature marker is moved, and only if its row changed.
+    
     Args:
         bitmap: The bitmap to draw on
         current: Current temperature
         min_temp: Minimum temperature for the day
         max_temp: Maximum temperature for the day
     """
-    bitmap.fill(0)  # Clear bitmap
+    global _last_range, _gradient_rows, _last_marker_y
     
     # Calculate temperature to index mapping constants
     temp_range = max_temp - min_temp
     pixel_range = TEMP_RANGE_BOTTOM - TEMP_RANGE_TOP
     scale = pixel_range / temp_range
     
-    # Draw temperature gradient bar
-    for y in range(TEMP_RANGE_TOP, TEMP_RANGE_BOTTOM + 1):
-        # Map y position to temperature
-        temp = max_temp - ((y - TEMP_RANGE_TOP) / scale)
-        # Get palette index for temperature
-        index = max(1, min(12, int(12 - ((temp - 20) * 11 / 70))))
-        # Draw gradient bar (full width since we're only 2 pixels wide)
-        for x in range(TEMP_RANGE_WIDTH):
-            bitmap[x, y] = index
-    
-    
-    # Calculate and draw current temperature marker
+    # Row for the current temperature marker
     current_y = int(TEMP_RANGE_BOTTOM - ((current - min_temp) * scale))
     current_y = max(TEMP_RANGE_TOP, min(TEMP_RANGE_BOTTOM, current_y))
     
+    if (min_temp, max_temp) != _last_range:
+        # No clear needed: every gradient row is rewritten below and rows
+        # outside TEMP_RANGE_TOP..TEMP_RANGE_BOTTOM are never drawn
+        
+        # Palette index for each row: the row's temperature
+        # max_temp - row * temp_range / pixel_range mapped onto indices 12..1
+        # (20-90°F), scaled by 70 * pixel_range so the division happens once per row
+        denominator = 70 * pixel_range
+        numerator = 12 * denominator - 11 * pixel_range * (max_temp - 20)
+        step = 11 * temp_range
+        _gradient_rows = tuple(
+            max(1, min(12, (numerator + row * step) // denominator))
+            for row in range(pixel_range + 1)
+        )
+        
+        # Draw temperature gradient bar, one rectangle fill per run of same-color rows
+        start = 0
+        for row in range(1, pixel_range + 2):
+            if row > pixel_range or _gradient_rows[row] != _gradient_rows[start]:
+                bitmaptools.fill_region(
+                    bitmap, 0, TEMP_RANGE_TOP + start,
+                    TEMP_RANGE_WIDTH, TEMP_RANGE_TOP + row, _gradient_rows[start]
+                )
+                start = row
+        _last_range = (min_temp, max_temp)
+    elif current_y == _last_marker_y:
+        return  # Same range and the marker is already on the right row
+    else:
+        # Restore the gradient under the previous marker
+        index = _gradient_rows[_last_marker_y - TEMP_RANGE_TOP]
+        bitmaptools.fill_region(bitmap, 0, _last_marker_y, TEMP_RANGE_WIDTH, _last_marker_y + 1, index)
+    
     # Draw current temperature marker (white line)
-    for x in range(TEMP_RANGE_WIDTH):
-        bitmap[x, current_y] = 14
+    bitmaptools.fill_region(bitmap, 0, current_y, TEMP_RANGE_WIDTH, current_y + 1, 14)
+    _last_marker_y = current_y
+
+def init_sun_path_arc(bitmap):
+    """
+    Clear the given bitmap and draw the static sun path arc on it.
+    
+    Args:
+        bitmap: The bitmap to draw on
+    """
+    global _last_sun_pos
+    bitmap.fill(0)  # Clear bitmap
+    
+    # Draw the arc path (more visible, higher in the display)
+    for x, y in enumerate(SUN_ARC_YS):
+        bitmap[x, y] = 1  # Arc color
+    _last_sun_pos = None
 
 def draw_sun_path(bitmap, current_time, sunrise_time, sunset_time):
     """
-    Draw the sun path arc and current sun position on the given bitmap.
+    Draw the current sun position on the given bitmap.
+    
+    The arc is drawn once by init_sun_path_arc(); this only repaints the 3x3
+    area around the old and new sun positions when the sun has moved.
     
     Args:
         bitmap: The bitmap to draw on
@@ -221,53 +316,66 @@ def draw_sun_path(bitmap, current_time, sunrise_time, sunset_time):
         sunrise_time: Sunrise Unix timestamp
         sunset_time: Sunset Unix timestamp
     """
-    bitmap.fill(0)  # Clear bitmap
-    
-    # Draw the arc path (more visible, higher in the display)
-    for x in range(20):
-        angle = (x / 19.0) * math.pi
-        y = int(15 - 8 * math.sin(angle))  # Raised base, adjusted amplitude
-        if 0 <= y < 16:
-            bitmap[x, y] = 1  # Arc color
+    global _last_sun_pos
+    sun_pos = None
     
     # Only draw sun during daytime
     if sunrise_time <= current_time <= sunset_time and sunset_time > sunrise_time:
-        try:
-            # Handle large timestamp values by working with offsets
-            time_offset = current_time - sunrise_time
-            day_length = sunset_time - sunrise_time
-            
-            # Calculate progress through the day (0.0 to 1.0)
-            day_progress = time_offset / day_length
-            day_progress = max(0.0, min(1.0, day_progress))
-            
-            # Calculate sun position
-            sun_x = int(day_progress * 19)
-            angle = (sun_x / 19.0) * math.pi
-            sun_y = int(15 - 8 * math.sin(angle))  # Match arc calculation
-            
-            # Ensure sun stays within bitmap bounds
-            sun_x = max(0, min(19, sun_x))
-            sun_y = max(1, min(14, sun_y))
-            
-            # Draw sun glow first (ensuring it doesn't overflow bounds)
-            for dy in [-1, 0, 1]:
-                for dx in [-1, 0, 1]:
-                    x, y = sun_x + dx, sun_y + dy
-                    if 0 <= x < 20 and 0 <= y < 16:
-                        # Create a more visible glow pattern
-                        if dx == 0 and dy == 0:
-                            continue  # Skip center (will be drawn last)
-                        elif abs(dx) + abs(dy) == 1:  # Direct neighbors
-                            bitmap[x, y] = 2  # Bright glow
-                        else:  # Diagonal neighbors
-                            bitmap[x, y] = 1  # Dimmer glow
+        # Handle large timestamp values by working with offsets
+        time_offset = current_time - sunrise_time
+        day_length = sunset_time - sunrise_time
+        
+        # Calculate progress through the day (0.0 to 1.0)
+        day_progress = time_offset / day_length
+        day_progress = max(0.0, min(1.0, day_progress))
+        
+        # Calculate sun position (clamped to bitmap bounds, following the arc)
+        sun_x = max(0, min(19, int(day_progress * 19)))
+        sun_pos = (sun_x, SUN_Y_BY_X[sun_x])
+    
+    if sun_pos == _last_sun_pos:
+        return  # Nothing moved
+    
+    try:
+        # Put the arc (or blank) back where the old sun was, skipping cells
+        # the new sun's glow is about to overwrite
+        if _last_sun_pos is not None:
+            old_x, old_y = _last_sun_pos
+            new_x, new_y = sun_pos or (-2, -2)  # Off-bitmap when the sun has set
+            for y in range(old_y - 1, old_y + 2):
+                for x in range(max(0, old_x - 1), min(20, old_x + 2)):
+                    if -1 <= x - new_x <= 1 and -1 <= y - new_y <= 1:
+                        continue
+                    bitmap[x, y] = 1 if SUN_ARC_YS[x] == y else 0
+        
+        if sun_pos is not None:
+            sun_x, sun_y = sun_pos
+            # Draw sun glow: bright direct neighbors, dimmer diagonals.
+            # sun_y is kept within 1..14, so only the columns need bounds checks.
+            xm, xp = sun_x - 1, sun_x + 1
+            ym, yp = sun_y - 1, sun_y + 1
+            if xm >= 0:
+                bitmap[xm, ym] = 1
+                bitmap[xm, sun_y] = 2
+                bitmap[xm, yp] = 1
+            bitmap[sun_x, ym] = 2
+            bitmap[sun_x, yp] = 2
+            if xp < 20:
+                bitmap[xp, ym] = 1
+                bitmap[xp, sun_y] = 2
+                bitmap[xp, yp] = 1
             
-            # Draw sun center last (always visible)
+            # Draw sun center (always visible)
             bitmap[sun_x, sun_y] = 2
-            
-        except Exception as e:
-            print("Error drawing sun:", e)
+        
+        _last_sun_pos = sun_pos
+        
+    except Exception as e:
+        print("Error drawing sun:", e)
+
+# Draw the static arc once; draw_sun_path only moves the sun along it
+_last_sun_pos = None  # (x, y) of the sun currently drawn, or None
+init_sun_path_arc(sun_path_bitmap)
 
 # Create loading message label
 loading_label = Label(terminalio.FONT, text="Loading...", color=0xFFFFFF)
@@ -281,47 +389,88 @@ group.append(temp_label)
 group.append(icons)
 group.append(temp_range)
 group.append(sun_path)
+group.append(loading_label)
+loading_label.hidden = True  # Shown only while fetching weather
+
+# Elements hidden while the loading text is shown (the weather icon stays)
+LOADING_HIDDEN = (time_label, temp_label, temp_range, sun_path)
 
 def show_loading():
     """Display loading state by showing only the weather icon and loading text."""
-    # Remove all elements except the weather icon
-    if time_label in group:
-        group.remove(time_label)
-    if temp_label in group:
-        group.remove(temp_label)
-    if temp_range in group:
-        group.remove(temp_range)
-    if sun_path in group:
-        group.remove(sun_path)
-    group.append(loading_label)
+    for element in LOADING_HIDDEN:
+        element.hidden = True
+    loading_label.hidden = False
     display.refresh()
 
 def hide_loading():
     """Restore normal display by showing all elements and hiding loading text."""
-    if loading_label in group:
-        group.remove(loading_label)
-    if time_label not in group:
-        group.append(time_label)
-    if temp_label not in group:
-        group.append(temp_label)
-    if temp_range not in group:
-        group.append(temp_range)
-    if sun_path not in group:
-        group.append(sun_path)
+    loading_label.hidden = True
+    for element in LOADING_HIDDEN:
+        element.hidden = False
     display.refresh()
 
-def get_icon(code):
+# Conditional request state: ETag of the last good response and its values
+_weather_etag = None
+_weather_values = None
+
+def fetch_weather_values(url):
     """
-    Get the icon index for a given weather condition code.
+    Fetch the WEATHER_JSON_PATHS values from the API, reusing the last response
+    when the server reports it unchanged.
     
     Args:
-        code: OpenWeather icon code (e.g., '01d' for clear day)
+        url: OpenWeather API URL
+    
+    Returns:
+        list: Values in WEATHER_JSON_PATHS order, or None on an HTTP error
+    """
+    global _weather_etag, _weather_values
+    headers = None
+    if _weather_etag is not None:
+        headers = {"If-None-Match": _weather_etag}
+    response = network.fetch(url, headers=headers)
+    
+    if response.status_code == 304:
+        # Not modified: skip downloading and parsing the body
+        response.close()
+        return _weather_values
+    if response.status_code != 200:
+        print("Weather fetch error: HTTP {}".format(response.status_code))
+        response.close()
+        return None
+    
+    etag = response.headers.get("etag")
+    # Only the WEATHER_JSON_PATHS values are kept from the response
+    try:
+        data = response.json()
+    finally:
+        response.close()
+    values = [network.json_traverse(data, path) for path in WEATHER_JSON_PATHS]
+    _weather_etag = etag
+    _weather_values = values
+    return values
+
+_fake_values = None  # WEATHER_JSON_PATHS values extracted from FAKE_RESPONSE
+
+def get_fake_weather_values():
+    """
+    Get the WEATHER_JSON_PATHS values from the simulated response.
+    
+    The fake response never changes, so its values are extracted once; it is
+    only imported when fake data is in use to keep it out of RAM otherwise.
     
     Returns:
-        int: Index of the icon in the sprite sheet
+        list: Values in WEATHER_JSON_PATHS order
     """
-    # Optimized lookup: try exact match first, then try base condition with 'd' suffix
-    return ICON_MAP.get(code) or ICON_MAP.get(code[:2] + 'd', 0)
+    global _fake_values
+    if _fake_values is None:
+        from fake_weather import FAKE_RESPONSE
+        _fake_values = [network.json_traverse(FAKE_RESPONSE, path) for path in WEATHER_JSON_PATHS]
+    return _fake_values
+
+# Last successful get_weather() result and failures since then
+_last_good_weather = None
+_weather_fail_count = 0
 
 def get_weather():
     """
@@ -338,49 +487,51 @@ def get_weather():
         - daily maximum temperature (int)
     
     Note:
-        Returns default values if the fetch fails:
-        (70°F, clear day, current time, current time, current time + 12h, 60°F, 80°F)
+        Returns the last good result if the fetch fails, or DEFAULT_WEATHER if
+        there hasn't been one yet. Consecutive failures are counted in
+        _weather_fail_count so the caller can back off.
     """
+    global _last_good_weather, _weather_fail_count
+    
+    # Show loading screen
+    show_loading()
+    
+    result = None
     try:
-        # Show loading screen
-        show_loading()
-        
         # Determine data source based on configuration
         if secrets.get('use_fake_data', False):
-            response = type('Response', (), {'text': json.dumps(FAKE_RESPONSE)})()
-            print("\nUsing Fake Data:")
+            values = get_fake_weather_values()
+            print("\nUsing Fake Data")
         else:
-            response = network.fetch(get_data_source_url(secrets['lat'], secrets['long']))
-            print("\nAPI Response:")
-            
-        print(response.text)
-        data = json.loads(response.text)
-        
-        # Extract weather data
-        current_data = data['current']
-        daily_data = data['daily'][0]['temp']
+            values = fetch_weather_values(DATA_SOURCE_URL)
         
-        result = (
-            int(current_data['temp']),
-            current_data['weather'][0]['icon'],
-            current_data['dt'],
-            current_data['sunrise'],
-            current_data['sunset'],
-            int(daily_data['min']),
-            int(daily_data['max'])
-        )
-        
-        # Hide loading screen
-        hide_loading()
-        
-        return result
-        
-    except Exception as e:
+        if values is not None:
+            temp, icon, dt, sunrise, sunset, daily_min, daily_max = values
+            result = (int(temp), icon, dt, sunrise, sunset, int(daily_min), int(daily_max))
+    except (OSError, RuntimeError, ValueError, KeyError, IndexError, TypeError,
+            MemoryError, OutOfRetries) as e:
+        # MemoryError: response too large to parse; OutOfRetries: socket retries ran out;
+        # TypeError: a null field in the response
         print("Weather fetch error: {}".format(e))
-        # Hide loading screen even on error
-        hide_loading()
-        # Return default values on error
-        return (70, "01d", 0, 0, 43200, 60, 80)  # Use 0 for time values
+    
+    # Hide loading screen whether or not the fetch worked
+    hide_loading()
+    
+    if result is None:
+        _weather_fail_count += 1
+        if _last_good_weather is not None:
+            return _last_good_weather
+        return DEFAULT_WEATHER
+    
+    if DEBUG:
+        print("Weather:", result)
+    _weather_fail_count = 0
+    _last_good_weather = result
+    return result
+
+# Last values written to the labels, so unchanged values skip re-rendering
+_last_time_key = None  # (display_hour, minute)
+_last_temp = None
 
 def update_time_display(hour, minute):
     """
@@ -390,89 +541,135 @@ def update_time_display(hour, minute):
         hour: Hour in 24-hour format
         minute: Minute
     """
+    global _last_time_key
     period = "PM" if hour >= 12 else "AM"
     display_hour = hour if hour <= 12 else hour - 12
     display_hour = 12 if display_hour == 0 else display_hour
-    time_label.text = "{:02d}:{:02d}".format(display_hour, minute)
+    # Compare before formatting so an unchanged time allocates no new string
+    time_key = (display_hour, minute)
+    if time_key != _last_time_key:
+        time_label.text = "{:02d}:{:02d}".format(display_hour, minute)
+        _last_time_key = time_key
 
-def update_weather_display(weather_data):
+def update_temp_display(current_temp):
+    """
+    Update the temperature label text and color.
+    
+    Args:
+        current_temp: Current temperature in Fahrenheit
+    """
+    global _last_temp
+    if current_temp != _last_temp:
+        temp_label.text = "{}°F".format(current_temp)
+        temp_label.color = temp_to_color(current_temp)
+        _last_temp = current_temp
+
+# Inputs last drawn by update_weather_display/update_sun_display, so repeated
+# data skips redraws
+_last_icon = None
+_last_temp_state = None  # (current_temp, min_temp, max_temp)
+_last_sun_state = None  # (timestamp // 60, sunrise, sunset)
+
+def update_sun_display(timestamp, sunrise, sunset):
+    """
+    Update the sun path for the given time, skipping unchanged minutes.
+    
+    Args:
+        timestamp: Current Unix timestamp (the local clock, not the API's)
+        sunrise: Sunrise Unix timestamp
+        sunset: Sunset Unix timestamp
+    """
+    global _last_sun_state
+    # The sun moves at most once a minute, so compare at minute granularity
+    sun_state = (timestamp // 60, sunrise, sunset)
+    if sun_state != _last_sun_state:
+        draw_sun_path(sun_path_bitmap, timestamp, sunrise, sunset)
+        _last_sun_state = sun_state
+
+def update_weather_display(weather_data, current_dt):
     """
     Update all weather-related display elements with new data.
     
     Args:
         weather_data: Tuple containing current weather data
             (temp, icon_code, timestamp, sunrise, sunset, min_temp, max_temp)
+        current_dt: Local clock Unix timestamp used to place the sun; the
+            API timestamp is stale when a failed fetch returned cached data
     """
-    current_temp, icon_code, timestamp, sunrise, sunset, min_temp, max_temp = weather_data
+    global _last_icon, _last_temp_state
+    current_temp, icon_code, _, sunrise, sunset, min_temp, max_temp = weather_data
     
-    icons[0] = get_icon(icon_code)
-    temp_label.text = "{}°F".format(current_temp)
-    temp_label.color = temp_to_color(current_temp)
-    draw_sun_path(sun_path_bitmap, timestamp, sunrise, sunset)
-    draw_temp_range(temp_range_bitmap, current_temp, min_temp, max_temp)
+    if icon_code != _last_icon:
+        # Exact match first, then fall back to the day icon for the base condition
+        icon_index = _ICON_LOOKUP.get(icon_code)
+        if icon_index is None:
+            icon_index = _ICON_LOOKUP.get(icon_code[:2], 0)
+        icons[0] = icon_index
+        _last_icon = icon_code
+    update_temp_display(current_temp)
+    update_sun_display(current_dt, sunrise, sunset)
+    
+    temp_state = (current_temp, min_temp, max_temp)
+    if temp_state != _last_temp_state:
+        draw_temp_range(temp_range_bitmap, current_temp, min_temp, max_temp)
+        _last_temp_state = temp_state
 
 # Initialize with default values
-last_weather_update = -time.monotonic()  # Force immediate update on first loop
-last_minute_update = time.monotonic()  # Track minute updates
-seconds_since_update = 0  # Track seconds since last API update
-current_temp = 70
-icon_code = "01d"
-current_dt = 0  # Will be updated from API
-sunrise_time = 0  # Will be updated from API
-sunset_time = 43200  # 12 hours by default
-min_temp = 60
-max_temp = 80
-
-# Get initial weather data
-weather_data = get_weather()
-current_dt = weather_data[2]  # Get initial time from API
-current_temp = weather_data[0]
-icon_code = weather_data[1]
-sunrise_time = weather_data[3]
-sunset_time = weather_data[4]
-min_temp = weather_data[5]
-max_temp = weather_data[6]
-
-# Initial display updates using API data
-local_timestamp = current_dt + (UTC_OFFSET * 3600)
-hour = (local_timestamp % 86400) // 3600
-minute = (local_timestamp % 3600) // 60
-update_time_display(hour, minute)
-
-temp_label.text = "{}°F".format(current_temp)
-temp_label.color = temp_to_color(current_temp)
-
-# Initial weather icon update
-icons[0] = ICON_MAP.get(icon_code, 0)
-
-# Initial display updates for temperature range and sun path
-draw_sun_path(sun_path_bitmap, current_dt, sunrise_time, sunset_time)
-draw_temp_range(temp_range_bitmap, current_temp, min_temp, max_temp)
-
-last_minute = minute  # Track the last minute we updated the display
-last_weather_update = time.monotonic()  # Start tracking from initial update
+weather_fetched = False  # The first pass of the main loop fetches immediately
+last_weather_update = 0  # time.monotonic() of the last weather fetch
+weather_interval = WEATHER_UPDATE_INTERVAL  # Seconds until the next fetch
+last_minute = None  # Local minutes since the epoch last shown on the clock
+clock_dt = 0  # Unix timestamp at clock_mono, synced from the API
+clock_mono = time.monotonic()  # time.monotonic() when clock_dt was taken
+last_synced_api_dt = None  # API timestamp the clock was last synced to
 
 # Main loop
 while True:
     current_time = time.monotonic()
+    # Local clock: last API timestamp advanced by the monotonic time since
+    current_dt = clock_dt + int(current_time - clock_mono)
     
-    # Update time display every minute
-    if current_time - last_minute_update >= 60:
-        # Calculate time based on last API update plus elapsed seconds
-        seconds_since_update = int(current_time - last_weather_update)
-        local_timestamp = (current_dt + seconds_since_update) + (UTC_OFFSET * 3600)
-        hour = int((local_timestamp % 86400) // 3600)
-        minute = int((local_timestamp % 3600) // 60)
-        
-        update_time_display(hour, minute)
-        last_minute_update = current_time
-
-    # Update weather data every WEATHER_UPDATE_INTERVAL seconds
-    if current_time - last_weather_update >= WEATHER_UPDATE_INTERVAL:
+    # Fetch weather on the first pass, then every weather_interval seconds
+    if not weather_fetched or current_time - last_weather_update >= weather_interval:
         weather_data = get_weather()
-        current_dt = weather_data[2]  # Update current time from API
-        update_weather_display(weather_data)
+        fetched_mono = time.monotonic()  # The API timestamp is from the end of the fetch
         last_weather_update = current_time
-        seconds_since_update = 0  # Reset elapsed seconds counter
+        weather_fetched = True
+        # Back off exponentially while fetches keep failing
+        weather_interval = WEATHER_UPDATE_INTERVAL << min(_weather_fail_count, WEATHER_MAX_BACKOFF)
+        
+        # Re-sync the clock on every successful fetch with a new API timestamp,
+        # in either direction, so a fast or slow local clock gets corrected.
+        # Fake data repeats the same timestamp, and failed fetches return the
+        # last good result or DEFAULT_WEATHER, so neither re-syncs.
+        if _weather_fail_count == 0 and weather_data[2] != last_synced_api_dt:
+            clock_dt = current_dt = weather_data[2]
+            clock_mono = fetched_mono
+            last_synced_api_dt = clock_dt
+        
+        update_weather_display(weather_data, current_dt)
+    
+    # Only split the time into hours and minutes when the displayed minute changes
+    local_minutes = (current_dt + UTC_OFFSET_SECONDS) // 60
+    if local_minutes != last_minute:
+        if last_minute is not None and local_minutes == last_minute + 1:
+            # Usual case: step the displayed time forward by one minute
+            minute += 1
+            if minute == 60:
+                minute = 0
+                hour = 0 if hour == 23 else hour + 1
+        else:
+            # First pass, or the clock jumped (API re-sync, missed minutes)
+            hour = (local_minutes // 60) % 24
+            minute = local_minutes % 60
+        update_time_display(hour, minute)
+        update_sun_display(current_dt, weather_data[3], weather_data[4])
+        last_minute = local_minutes
     
-    # No sleep needed - the display hardware handles the refresh rate
+    # Sleep until the clock's next minute boundary or the next weather fetch.
+    # The minute phase comes from the integer clock_dt, since CircuitPython
+    # floats can't hold a Unix timestamp to the second.
+    now = time.monotonic()
+    until_minute = 60 - (clock_dt % 60 + now - clock_mono) % 60
+    until_weather = last_weather_update + weather_interval - now
+    time.sleep(max(0.1, min(until_minute, until_weather)))